@@ -2,10 +2,10 @@
 
 # Convenience direct imports from spicelib
 from spicelib.utils.sweep_iterators import *
-from spicelib.editor.qsch_editor import QschEditor
 from spicelib.editor.spice_editor import SpiceEditor
 from spicelib.raw.raw_read import RawRead
 from spicelib.raw.raw_write import RawWrite, Trace
 from spicelib.log.qspice_log_reader import QspiceLogReader
+from qspice.editor.qsch_editor import QschEditor
 from qspice.sim.sim_runner import SimRunner
 from qspice.qspice import Qspice
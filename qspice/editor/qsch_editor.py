@@ -0,0 +1,968 @@
+#!/usr/bin/env python
+# coding=utf-8
+# -------------------------------------------------------------------------------
+#
+#  ███████╗██████╗ ██╗ ██████╗███████╗██╗     ██╗██████╗
+#  ██╔════╝██╔══██╗██║██╔════╝██╔════╝██║     ██║██╔══██╗
+#  ███████╗██████╔╝██║██║     █████╗  ██║     ██║██████╔╝
+#  ╚════██║██╔═══╝ ██║██║     ██╔══╝  ██║     ██║██╔══██╗
+#  ███████║██║     ██║╚██████╗███████╗███████╗██║██████╔╝
+#  ╚══════╝╚═╝     ╚═╝ ╚═════╝╚══════╝╚══════╝╚═╝╚═════╝
+#
+# Name:        qsch_editor.py
+# Purpose:     QSPICE Schematic editor with a faster parser than the one in spicelib
+#
+# Author:      Nuno Brum (nuno.brum@gmail.com)
+#
+# Created:     14-10-2026
+# Licence:     refer to the LICENSE file
+# -------------------------------------------------------------------------------
+"""
+Specialization of the spicelib QschEditor. The interface is the same as in spicelib, only the internals that are
+performance critical when reading, editing and writing large schematics are re-implemented here.
+"""
+import math
+import mmap
+import os
+import re
+import sys
+import logging
+from array import array
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Union
+
+from spicelib.editor.base_editor import (
+    format_eng, ParameterNotFoundError, PARAM_REGEX, UNIQUE_SIMULATION_DOT_INSTRUCTIONS
+)
+from spicelib.editor.qsch_editor import (
+    QschEditor as QschEditorBase, QschTag as QschTagBase, QschReadingError,
+    QSCH_HEADER, QSCH_COMPONENT_POS, QSCH_COMPONENT_ROTATION, QSCH_COMPONENT_ENABLED,
+    QSCH_SYMBOL_TEXT_REFDES, QSCH_SYMBOL_TEXT_VALUE,
+    QSCH_WIRE_POS1, QSCH_WIRE_POS2, QSCH_WIRE_NET,
+    QSCH_NET_POS, QSCH_NET_STR_ATTR,
+    QSCH_TEXT_POS, QSCH_TEXT_SIZE, QSCH_TEXT_COMMENT, QSCH_TEXT_STR_ATTR, QSCH_TEXT_INSTR_QUALIFIER,
+)
+from spicelib.editor.base_schematic import BaseSchematic, SchematicComponent, Point, ERotation, Line, Text, TextTypeEnum
+
+__all__ = ('QschEditor', 'QschTag')
+
+_logger = logging.getLogger("qspice.QschEditor")
+
+# A token is either a tag delimiter or a sequence of quoted strings, parenthesized tuples and plain characters.
+# Quotes and parenthesis protect spaces and tag delimiters, as in the QSPICE file format. Unlike the spicelib parser,
+# which accepts any depth, parenthesis can only be nested one level, as in (a,(b,c)). This is enough for QSPICE files.
+# A quote or parenthesis that isn't closed, or that nests deeper, is matched alone by the last alternative so that it
+# can be reported. Complete strings and tuples have at least two characters, so no valid token is just a " or a (.
+if sys.version_info >= (3, 11):
+    # Same tokens, but with possessive quantifiers the regex engine doesn't keep backtracking points
+    _TOKEN_RE = re.compile(r'«|»|(?:[^ \n«»"(]++|"[^"]*+"|\((?:[^()]++|\([^()]*+\))*+\))++|["(]')
+else:
+    _TOKEN_RE = re.compile(r'«|»|(?:"[^"]*"|\((?:[^()]|\([^()]*\))*\)|[^ \n«»"(])+|["(]')
+
+_MISSING = object()  # Sentinel for cache misses
+
+_MMAP_THRESHOLD = 1 << 20  # Files larger than this are decoded directly from a memory map
+
+_QSCH_HEADER_BYTES = bytes(QSCH_HEADER)
+_QSCH_HEADER_STR = _QSCH_HEADER_BYTES.decode('cp1252')  # The header as it is after decoding the file
+
+
+def _write_buffers(file, buffers: List[bytes]):
+    """Writes a list of buffers to a binary file. Where available, a single vectored write is used."""
+    if hasattr(os, 'writev'):
+        file.flush()
+        written = os.writev(file.fileno(), buffers)
+        if written < sum(len(buffer) for buffer in buffers):
+            file.write(b''.join(buffers)[written:])  # The rest of a partial write
+    else:
+        for buffer in buffers:
+            file.write(buffer)
+
+
+@lru_cache(maxsize=256)
+def _param_regex(param: str) -> re.Pattern:
+    """Returns the compiled regular expression that matches a .PARAM instruction defining the parameter."""
+    return re.compile(r'\.PARAM.*?' + PARAM_REGEX % re.escape(param), re.IGNORECASE)
+
+
+class _TrackedList(list):
+    """A list that belongs to a QschTag and that calls the given method of it whenever it is changed. The tag lists
+    are changed directly by the spicelib editor, so the caches of the tag need to know about it."""
+    __slots__ = ('_owner', '_changed')
+
+    def __init__(self, owner: 'QschTag', values: Iterable, on_change: Callable[..., None]):
+        super().__init__(values)
+        self._owner = owner
+        self._changed = on_change
+
+    def __reduce_ex__(self, protocol):
+        # Otherwise copy and pickle would restore the values through append(), as if they were being changed.
+        # The subclasses are made from the owner and the values.
+        return self.__class__, (self._owner, list(self))
+
+    def append(self, value):
+        super().append(value)
+        self._changed()
+
+    def extend(self, values: Iterable):
+        super().extend(values)
+        self._changed()
+
+    def __iadd__(self, values: Iterable):
+        self.extend(values)
+        return self
+
+    def __imul__(self, n: int):
+        super().__imul__(n)
+        self._changed()
+        return self
+
+    def insert(self, index: int, value):
+        super().insert(index, value)
+        self._changed()
+
+    def remove(self, value):
+        super().remove(value)
+        self._changed()
+
+    def pop(self, index: int = -1):
+        value = super().pop(index)
+        self._changed()
+        return value
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def sort(self, *args, **kwargs):
+        super().sort(*args, **kwargs)
+        self._changed()
+
+    def reverse(self):
+        super().reverse()
+        self._changed()
+
+    def __setitem__(self, index, value):
+        super().__setitem__(index, value)
+        self._changed()
+
+    def __delitem__(self, index):
+        super().__delitem__(index)
+        self._changed()
+
+
+class _TagList(_TrackedList):
+    """The list of children of a QschTag. Changing it keeps the index of the children by tag id updated."""
+    __slots__ = ()
+
+    def __init__(self, owner: 'QschTag', tags: Iterable['QschTag'] = ()):
+        super().__init__(owner, tags, owner._items_changed)
+
+    def append(self, tag: 'QschTag'):
+        self._owner.add_child(tag)  # Doesn't need to index all the children again
+
+
+class _TokenList(_TrackedList):
+    """The list of tokens of a QschTag. Changing it discards the decoded attributes and the text kept by _emit()."""
+    __slots__ = ()
+
+    def __init__(self, owner: 'QschTag', tokens: Iterable[str] = ()):
+        super().__init__(owner, tokens, owner._tokens_changed)
+
+    def append(self, token: str):
+        list.append(self, token)
+        self._changed(len(self) > 1)
+
+    def extend(self, tokens: Iterable[str]):
+        same_tag_id = len(self) > 0
+        list.extend(self, tokens)
+        self._changed(same_tag_id)
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._changed(isinstance(index, int) and index % len(self) != 0)
+
+
+class QschTag(QschTagBase):
+    """
+    Class to represent a tag in a QSCH file. It is a recursive class, so it can have children tags.
+    """
+
+    def __init__(self, *tokens):
+        self._items = _TagList(self)
+        self._tokens = _TokenList(self)
+        self._removed = set()  # Children removed, but not yet taken out of the lists. See _compact()
+        self._parent = None
+        self._emitted = None  # Text written by the last _emit(), None if the tag or its children changed since
+        self._emitted_level = 0
+        self._attr_cache = {}  # Decoded attributes indexed by token position
+        self._by_tag = {}  # Children tags indexed by their tag id
+        self._changes = 0  # Counts the changes to the children list and to the tokens of the children
+        super().__init__(*tokens)
+
+    def _reset(self, *tokens):
+        """Re-initializes the tag in place, so that it can be reused. Children tags are discarded."""
+        list.clear(self._items)
+        self._removed.clear()
+        self._parent = None
+        self._emitted = None
+        list.clear(self._tokens)
+        list.extend(self._tokens, (str(token) for token in tokens))
+        self._attr_cache.clear()
+        self._by_tag.clear()
+
+    @property
+    def items(self) -> List['QschTag']:
+        """The children tags, in the order they appear in the file."""
+        if self._removed:
+            self._compact()
+        return self._items
+
+    @items.setter
+    def items(self, items: List['QschTag']):
+        self._items = _TagList(self, items)
+        self._reindex()
+        self._children_changed()
+
+    @property
+    def tokens(self) -> List[str]:
+        """The tokens of the tag. The first one is the tag id."""
+        return self._tokens
+
+    @tokens.setter
+    def tokens(self, tokens: List[str]):
+        self._tokens = _TokenList(self, tokens)
+        self._tokens_changed(False)
+
+    def _tokens_changed(self, same_tag_id: bool = False):
+        """Called when the tokens were changed. If the tag id may have changed, the parent index is built again."""
+        self._attr_cache.clear()
+        parent = self._parent
+        if parent is not None:
+            if not same_tag_id:
+                parent._reindex()
+            parent._changes += 1
+        self._touch()
+
+    def _items_changed(self):
+        """Called when the list of children was changed directly."""
+        self._reindex()
+        self._children_changed()
+
+    def _children_changed(self):
+        """Called when the list of children was changed. The change count lets the owners of caches built from the
+        children, such as the QschEditor, know if these are still valid."""
+        self._changes += 1
+        self._touch()
+
+    def _touch(self):
+        """Discards the text kept from the last _emit() on this tag and on all the tags that contain it."""
+        tag = self
+        while tag is not None:
+            tag._emitted = None
+            tag = tag._parent
+
+    def _compact(self):
+        """Takes the removed children out of the children lists. Removals are done in bulk this way, keeping the
+        order of the remaining children."""
+        removed = self._removed
+        # Done in place, as the list may be held by the caller
+        list.__setitem__(self._items, slice(None), [tag for tag in self._items if tag not in removed])
+        for tag_id in {tag.tag for tag in removed}:
+            self._by_tag[tag_id] = [tag for tag in self._by_tag[tag_id] if tag not in removed]
+        removed.clear()
+
+    def _reindex(self):
+        """Builds again the index of the children by tag id, after the list of children was changed directly.
+        Removed children are taken out of the list, and the ones that are no longer on it lose this tag as parent."""
+        items = self._items
+        if self._removed:
+            list.__setitem__(items, slice(None), [tag for tag in items if tag not in self._removed])
+            self._removed.clear()
+        children = set(items)
+        for tags in self._by_tag.values():
+            for tag in tags:
+                if tag._parent is self and tag not in children:
+                    tag._parent = None
+        self._by_tag = by_tag = {}
+        for tag in items:
+            tag._parent = self
+            by_tag.setdefault(tag.tag, []).append(tag)
+
+    @classmethod
+    def from_tokens(cls, tokens: Iterable[str], new_tag: Optional[Callable[[], 'QschTag']] = None) -> 'QschTag':
+        """
+        Builds a tag tree from a token sequence, as the one produced by the QSCH tokenizer. The iteration stops
+        as soon as the first tag is closed.
+
+        :param tokens: The sequence of tokens. The first token must be a «
+        :param new_tag: Function that returns an empty tag. If not given, new instances of this class are created.
+        :return: The tag that was read
+        """
+        if new_tag is None:
+            new_tag = cls
+        # The tags aren't indexed nor written before being closed, so their tokens are changed without tracking
+        append, set_token = list.append, list.__setitem__
+        stack = []
+        for token in tokens:
+            if token == '«':
+                stack.append(new_tag())
+            elif token == '»':
+                if not stack:
+                    raise QschReadingError("Unexpected » when reading file")
+                tag = stack.pop()
+                tag_tokens = tag._tokens
+                if tag_tokens:
+                    # Tag ids, and the values of labels such as «type: R», repeat all over the schematic
+                    set_token(tag_tokens, 0, sys.intern(tag_tokens[0]))
+                    if len(tag_tokens) > 1 and tag_tokens[0][-1] == ':':
+                        set_token(tag_tokens, 1, sys.intern(tag_tokens[1]))
+                if not stack:
+                    return tag
+                stack[-1]._append_child(tag)  # Only now the tag id is known
+            elif stack:
+                append(stack[-1]._tokens, token)
+            else:
+                raise QschReadingError(f"Unexpected token '{token}' outside of a tag")
+        raise QschReadingError("Missing » when reading file")
+
+    @classmethod
+    def parse(cls, stream: str, start: int = 0) -> ('QschTag', int):
+        """
+        Parses a tag from the stream starting at the given position. The stream should be a string.
+
+        :param stream: The string to be parsed
+        :param start: The position to start parsing
+        :return: A tuple with the tag and the position after the tag
+        """
+        assert stream[start] == '«'
+        last = None
+
+        def tokens():
+            nonlocal last
+            for last in _TOKEN_RE.finditer(stream, start):
+                token = last.group()
+                if token == '"' or token == '(':
+                    raise QschReadingError(f"Unterminated string or parenthesis at position {last.start()}")
+                yield token
+
+        tag = cls.from_tokens(tokens())
+        return tag, last.end()
+
+    def _emit(self, buf: list, level: int):
+        """
+        Appends the representation of the tag and all its children to a list of strings.
+        The text of the tag and of its direct children is kept, so that on the next call only the children that
+        were changed in the meantime are written again. This makes saving the schematic repeatedly, with just
+        a few values changed each time, much cheaper.
+
+        :param buf: The list where the strings are appended
+        :param level: The indentation level
+        """
+        top = level
+        stack = [(self, level, None)]  # The position in buf is given when closing a tag with children
+        while stack:
+            tag, level, start = stack.pop()
+            spaces = '  ' * level
+            if start is not None:
+                buf.append(spaces)
+                buf.append('»\n')
+            elif tag._emitted is not None and tag._emitted_level == level:
+                buf.append(tag._emitted)
+                continue
+            else:
+                start = len(buf)
+                buf.append(spaces)
+                buf.append('«')
+                buf.append(' '.join(tag._tokens))
+                if tag.items:
+                    buf.append('\n')
+                    stack.append((tag, level, start))
+                    stack.extend((child, level + 1, None) for child in reversed(tag.items))
+                    continue
+                buf.append('»\n')
+            if level <= top + 1:
+                tag._emitted = ''.join(buf[start:])
+                tag._emitted_level = level
+
+    def out(self, level):
+        # docstring inherited from spicelib QschTag
+        buf = []
+        self._emit(buf, level)
+        return ''.join(buf)
+
+    def _append_child(self, tag: 'QschTag'):
+        """Appends a child tag without discarding the text kept by _emit(). Only used when building new tags."""
+        tag._parent = self
+        list.append(self._items, tag)
+        self._by_tag.setdefault(tag.tag, []).append(tag)
+
+    def add_child(self, tag: 'QschTag'):
+        """Appends a child tag. The same as items.append(tag)."""
+        if tag in self._removed:
+            self._compact()  # Otherwise the tag would be taken out again
+        self._append_child(tag)
+        self._children_changed()
+
+    def remove_child(self, tag: 'QschTag'):
+        """Removes a child tag, keeping the index used by get_items() updated. The lists of children are only
+        updated when next accessed, so that removing many children is not quadratic."""
+        if tag._parent is not self:
+            raise ValueError(f"{tag} is not a child of {self}")
+        tag._parent = None
+        self._removed.add(tag)
+        self._children_changed()
+
+    def get_items(self, item) -> List['QschTag']:
+        # docstring inherited from spicelib QschTag
+        if self._removed:
+            self._compact()
+        return list(self._by_tag.get(item, ()))
+
+    def get_text(self, label, default: str = None) -> str:
+        # docstring inherited from spicelib QschTag
+        if self._removed:
+            self._compact()
+        a = self._by_tag.get(label + ':', ())
+        if len(a) != 1:
+            if default is None:
+                raise IndexError(f"Label '{label}' not found in:{self}")
+            else:
+                return default
+        return a[0].tokens[1]
+
+    def get_attr(self, index: int):
+        # docstring inherited from spicelib QschTag
+        value = self._attr_cache.get(index, _MISSING)
+        if value is _MISSING:
+            value = self._attr_cache[index] = self._decode_attr(self._tokens[index])
+        return value
+
+    @staticmethod
+    def _decode_attr(a: str):
+        """Decodes an attribute token the same way as the spicelib get_attr(), but testing only the first
+        character to know which kind of attribute it is."""
+        c = a[:1]
+        if c == '(':
+            if a[-1] == ')':
+                return tuple(int(x) for x in a[1:-1].split(','))
+        elif c == '"':
+            if a[-1] == '"':
+                return a[1:-1]
+        elif c == '0':
+            if a[1:2] == 'x':
+                return int(a[2:], 16)
+        return int(a)
+
+
+class QschEditor(QschEditorBase):
+    """Class made to update directly QSCH files. It is a subclass of the spicelib QschEditor, and it can be used in
+    exactly the same way.
+
+    :param qsch_file: Path to the QSCH file to be edited
+    :type qsch_file: str
+    :keyword create_blank: If True, the file will be created from scratch. If False, the file will be read and parsed
+    """
+
+    def __init__(self, qsch_file: str, create_blank: bool = False):
+        self._text_tags = []  # Text tags placed directly on the schematic
+        self._text_strs = []  # Their text, without the instruction qualifier
+        self._text_uppers = []  # The same text in upper case, for the case-insensitive searches
+        self._text_index = {}  # Position of each text tag in the lists above, and in self.directives
+        self._xs = array('i')  # X and Y of all the coordinates that the schematic tags occupy on the canvas.
+        self._ys = array('i')  # None when they need to be computed again
+        self._bbox = None  # Bounding box of the schematic [min_x, min_y, max_x, max_y]. None if it needs computing
+        self._net_points = {}  # Net names at each net label and wire end, built when parsing
+        self._tag_pool: List[QschTag] = []  # Tags of a discarded schematic, available for reuse
+        self._indexed_schematic = None  # The schematic tag the caches above were built for,
+        self._indexed_changes = 0  # and its change count at that moment. See _update_index()
+        super().__init__(qsch_file, create_blank)
+
+    def save_as(self, qsch_filename: Union[str, Path]) -> None:
+        """
+        Saves the schematic to a QSCH file. The file is saved in cp1252 encoding.
+        """
+        if self.updated or Path(qsch_filename) != self._qsch_file_path:
+            buf = []
+            self.schematic._emit(buf, 0)
+            buf.append('\n')  # Terminates the new line
+            body = ''.join(buf)
+            if os.linesep != '\n':  # Same line terminators as when writing in text mode
+                body = body.replace('\n', os.linesep)
+            with open(qsch_filename, 'wb') as qsch_file:
+                _logger.info(f"Writing QSCH file {qsch_file}")
+                _write_buffers(qsch_file, [_QSCH_HEADER_BYTES, body.encode('cp1252')])
+            if Path(qsch_filename) == self._qsch_file_path:
+                self.updated = False
+        # now checks if there are subcircuits that need to be saved
+        for component in self.components.values():
+            if "_SUBCKT" in component.attributes:
+                sub_circuit = component.attributes["_SUBCKT"]
+                if sub_circuit.updated:
+                    sub_circuit.save_as(sub_circuit._qsch_file_path)
+
+    def reset_netlist(self, create_blank: bool = False) -> None:
+        """
+        If create_blank is True, it creates a blank netlist.
+
+        If False, it reads the netlist from the file into memory. If the file does not exist, it raises a FileNotFoundError.
+
+        All previous edits done to the netlist are lost.
+
+        The tags of the previous schematic are reused for the new one, so any reference to them obtained before, such
+        as ``get_component('R1').attributes['tag']``, is no longer valid and must be fetched again.
+
+        :param create_blank: If True, the file will be created from scratch. If False, the file will be read and parsed
+        """
+        super(QschEditorBase, self).reset_netlist(create_blank)
+        if not create_blank:
+            if not self._qsch_file_path.exists():
+                raise FileNotFoundError(f"File {self._qsch_file_path} not found")
+            with open(self._qsch_file_path, 'rb') as qsch_file:
+                _logger.info(f"Reading QSCH file {self._qsch_file_path}")
+                if os.fstat(qsch_file.fileno()).st_size > _MMAP_THRESHOLD:
+                    # Decoding from the map avoids holding both the bytes and the string in memory
+                    with mmap.mmap(qsch_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        stream = str(data, 'cp1252')
+                else:
+                    stream = qsch_file.read().decode('cp1252')
+            if '\r' in stream:  # Same newline translation as when reading in text mode
+                stream = stream.replace('\r\n', '\n').replace('\r', '\n')
+            self._parse_qsch_stream(stream)
+
+    def _parse_qsch_stream(self, stream):
+        """Parses the QSCH file stream"""
+        self.components.clear()
+        _logger.debug("Parsing QSCH file")
+        if not stream.startswith(_QSCH_HEADER_STR):
+            raise QschReadingError("Missing header. The QSCH file should start with: " +
+                                   f"{_QSCH_HEADER_BYTES.hex(' ').upper()}")
+
+        tokens = _TOKEN_RE.findall(stream, 4)
+        if '"' in tokens or '(' in tokens:
+            raise QschReadingError("Unterminated string or parenthesis when reading file")
+        self._release_tags()
+        self.schematic = QschTag.from_tokens(tokens, self._acquire_tag)
+        self._net_points = self._index_net_points()
+
+        components = self.schematic.get_items('component')
+        for component in components:
+            symbol: QschTag = component.get_items('symbol')[0]
+            texts = symbol.get_items('text')
+            if len(texts) < 2:
+                raise RuntimeError(f"Missing texts in component at coordinates {component.get_attr(1)}")
+            refdes = texts[QSCH_SYMBOL_TEXT_REFDES].get_attr(QSCH_TEXT_STR_ATTR)
+            value = texts[QSCH_SYMBOL_TEXT_VALUE].get_attr(QSCH_TEXT_STR_ATTR)
+            sch_comp = SchematicComponent()
+            sch_comp.reference = refdes
+            x, y = position = component.get_attr(QSCH_COMPONENT_POS)
+            orientation = component.get_attr(QSCH_COMPONENT_ROTATION)
+            sch_comp.position = Point(x, y)
+            sch_comp.rotation = orientation * 45
+            sch_comp.attributes['type'] = symbol.get_text('type', "X")  # Assuming a sub-circuit
+            sch_comp.attributes['description'] = symbol.get_text('description', "No Description")
+            sch_comp.attributes['value'] = value
+            sch_comp.attributes['tag'] = component
+            sch_comp.attributes['enabled'] = component.get_attr(QSCH_COMPONENT_ENABLED) == 0
+            pins = symbol.get_items('pin')
+            sch_comp.ports = [self._find_net_at_pin(position, orientation, pin) for pin in pins]
+            self.components[refdes] = sch_comp
+            if refdes.startswith('X'):
+                sub_circuit_name = value + os.path.extsep + 'qsch'
+                sub_circuit_schematic_file = self._qsch_file_find(sub_circuit_name)
+                if sub_circuit_schematic_file:
+                    sub_schematic = QschEditor(sub_circuit_schematic_file)
+                    sch_comp.attributes['_SUBCKT'] = sub_schematic  # Store it for future use.
+
+        for net in self.schematic.get_items('net'):
+            # process nets
+            x, y = net.get_attr(QSCH_NET_POS)
+            net_name = net.get_attr(QSCH_NET_STR_ATTR)
+            self.labels.append(Text(Point(x, y), net_name, type=TextTypeEnum.LABEL))
+
+        for wire in self.schematic.get_items('wire'):
+            # process wires
+            x1, y1 = wire.get_attr(QSCH_WIRE_POS1)
+            x2, y2 = wire.get_attr(QSCH_WIRE_POS2)
+            net = wire.get_attr(QSCH_WIRE_NET)
+            self.wires.append(Line(Point(x1, y1), Point(x2, y2), net))
+
+        self._index_schematic()
+
+    @staticmethod
+    def _text_from_tag(text_tag: QschTag) -> Text:
+        """Returns the Text object that represents a text tag of the schematic."""
+        x, y = text_tag.get_attr(QSCH_TEXT_POS)
+        point = Point(x, y)
+        text = text_tag.get_attr(QSCH_TEXT_STR_ATTR)
+        text_size = text_tag.get_attr(QSCH_TEXT_SIZE)
+        if text_tag.get_attr(QSCH_TEXT_COMMENT) == 1:
+            type_text = TextTypeEnum.COMMENT
+        elif text.startswith(QSCH_TEXT_INSTR_QUALIFIER):
+            type_text = TextTypeEnum.DIRECTIVE
+            text = text.lstrip(QSCH_TEXT_INSTR_QUALIFIER)  # Eliminates the qualifer from the text.
+        else:
+            type_text = TextTypeEnum.NULL
+        return Text(point, text, text_size, type_text)
+
+    def _acquire_tag(self) -> QschTag:
+        """Returns an empty tag, reusing one from the pool when available."""
+        if self._tag_pool:
+            return self._tag_pool.pop()
+        return QschTag()
+
+    def _release_tags(self):
+        """Clears all the tags of the current schematic and places them on the pool for reuse."""
+        if self.schematic is None:
+            return
+        stack = [self.schematic]
+        while stack:
+            tag = stack.pop()
+            stack.extend(tag.items)
+            tag._reset()
+            self._tag_pool.append(tag)
+        self.schematic = None
+
+    def _index_schematic(self, directives: Optional[List[Text]] = None):
+        """Builds the lookup caches of the schematic tags. Needs to be called whenever self.schematic is replaced.
+
+        :param directives: The directives of the text tags, in the same order. If not given, they are read from the
+            tags, so that they can be updated by position.
+        """
+        self._text_tags = self.schematic.get_items('text')
+        self._text_strs = [tag.get_attr(QSCH_TEXT_STR_ATTR).lstrip(QSCH_TEXT_INSTR_QUALIFIER)
+                           for tag in self._text_tags]
+        self._text_uppers = [text.upper() for text in self._text_strs]
+        if directives is None:
+            directives = [self._text_from_tag(tag) for tag in self._text_tags]
+        self.directives = directives
+        self._text_index = {tag: i for i, tag in enumerate(self._text_tags)}
+        self._index_coordinates()
+        self._bbox = self._compute_bbox()
+        self._mark_indexed()
+
+    def _mark_indexed(self):
+        """Records that the caches match the schematic as it is now. Called after the caches are built, and after the
+        editor methods change the schematic and the caches together."""
+        self._indexed_schematic = self.schematic
+        self._indexed_changes = self.schematic._changes
+
+    def _update_index(self):
+        """Builds the caches again if the schematic was replaced, or if its tags were changed directly through
+        schematic.items or the tag tokens, instead of through the editor methods."""
+        schematic = self.schematic
+        if schematic is None:
+            return
+        if schematic is not self._indexed_schematic or schematic._changes != self._indexed_changes:
+            _logger.debug("Schematic changed directly, indexing it again")
+            # The directives of the texts that are still the same are kept, as they may have been copied from another
+            # editor. See copy_from()
+            kept = {tag: (text, directive)
+                    for tag, text, directive in zip(self._text_tags, self._text_strs, self.directives)}
+            directives = []
+            for tag in schematic.get_items('text'):
+                text, directive = kept.get(tag, (None, None))
+                if text is None or text != tag.get_attr(QSCH_TEXT_STR_ATTR).lstrip(QSCH_TEXT_INSTR_QUALIFIER):
+                    directive = self._text_from_tag(tag)
+                directives.append(directive)
+            self._index_schematic(directives)
+
+    def _index_net_points(self) -> dict:
+        """Returns a dictionary with the net name at each net label position and wire end. Net labels take precedence
+        over wires, and the first ones found over the ones that follow."""
+        points = {}
+        for wire in self.schematic.get_items('wire'):
+            net_name = wire.get_attr(QSCH_WIRE_NET)
+            points.setdefault(wire.get_attr(QSCH_WIRE_POS1), net_name)
+            points.setdefault(wire.get_attr(QSCH_WIRE_POS2), net_name)
+        net_points = {}
+        for net in self.schematic.get_items('net'):
+            net_points.setdefault(net.get_attr(QSCH_NET_POS), net.get_attr(QSCH_NET_STR_ATTR))
+        points.update(net_points)
+        return {point: '0' if net_name == 'GND' else net_name for point, net_name in points.items()}
+
+    def _find_net_at_pin(self, comp_pos, orientation: int, pin: QschTag) -> str:
+        """Returns the net name at the pin position"""
+        pin_pos = pin.get_attr(1)
+        hyp = (pin_pos[0] ** 2 + pin_pos[1] ** 2) ** 0.5
+        if orientation % 2:
+            # in 45º rotations the component is 1.414 times larger
+            hyp *= 1.414
+        if 0 <= orientation <= 7:
+            theta = math.atan2(pin_pos[1], pin_pos[0]) + math.radians(orientation * 45)
+            x = comp_pos[0] + round(hyp * math.cos(theta), -2)  # round to multiple of 100
+            y = comp_pos[1] + round(hyp * math.sin(theta), -2)
+        elif 8 <= orientation <= 15:
+            # The component is mirrored on the X axis
+            theta = math.atan2(pin_pos[1], pin_pos[0]) + math.radians((orientation - 8) * 45)
+            x = comp_pos[0] - round(hyp * math.cos(theta), -2)  # round to multiple of 100
+            y = comp_pos[1] + round(hyp * math.sin(theta), -2)
+        else:
+            raise ValueError(f"Invalid orientation: {orientation}")
+        net_name = self._net_points.get((x, y))
+        if net_name is None:
+            raise QschReadingError(f"Failed to find the net for {pin} in component in position {comp_pos}")
+        return net_name
+
+    def _index_coordinates(self):
+        """Fills the coordinate arrays with the coordinates of all the schematic tags."""
+        self._xs = array('i')
+        self._ys = array('i')
+        for tag in self.schematic.items:
+            self._add_coordinates(tag)
+
+    def _add_coordinates(self, tag: QschTag):
+        """Adds the coordinates of a tag to the coordinate arrays."""
+        if self._xs is None:
+            return  # They will be all computed again
+        for x, y in self._tag_coordinates(tag):
+            self._xs.append(x)
+            self._ys.append(y)
+
+    def _add_item(self, tag: QschTag):
+        """Appends a tag to the schematic, keeping the schematic caches updated."""
+        self._update_index()
+        self.schematic.add_child(tag)
+        if tag.tag == 'text':
+            self._text_index[tag] = len(self._text_tags)
+            self._text_tags.append(tag)
+            self._text_strs.append(tag.get_attr(QSCH_TEXT_STR_ATTR).lstrip(QSCH_TEXT_INSTR_QUALIFIER))
+            self._text_uppers.append(self._text_strs[-1].upper())
+            self.directives.append(self._text_from_tag(tag))
+        self._add_coordinates(tag)
+        if self._bbox is not None:
+            bbox = self._bbox
+            for x, y in self._tag_coordinates(tag):
+                bbox[0] = min(bbox[0], x)
+                bbox[1] = min(bbox[1], y)
+                bbox[2] = max(bbox[2], x)
+                bbox[3] = max(bbox[3], y)
+        self._mark_indexed()
+
+    def _remove_item(self, tag: QschTag):
+        """Removes a tag from the schematic, keeping the schematic caches updated."""
+        self._remove_items([tag])
+
+    def _remove_items(self, tags: List[QschTag]):
+        """Removes tags from the schematic, keeping the schematic caches updated. The text caches are rebuilt in a
+        single pass, so that removing many texts at once is not quadratic."""
+        self._update_index()
+        removed = {tag for tag in tags if tag.tag == 'text'}
+        if removed:
+            keep = [i for i, tag in enumerate(self._text_tags) if tag not in removed]
+            self._text_tags = [self._text_tags[i] for i in keep]
+            self._text_strs = [self._text_strs[i] for i in keep]
+            self._text_uppers = [self._text_uppers[i] for i in keep]
+            self.directives[:] = [self.directives[i] for i in keep]
+            self._text_index = {tag: i for i, tag in enumerate(self._text_tags)}
+        for tag in tags:
+            self.schematic.remove_child(tag)
+            if self._tag_coordinates(tag):
+                self._xs = self._ys = None
+                self._bbox = None  # The bounding box may have shrunk
+        self._mark_indexed()
+
+    def _set_text(self, text_tag: QschTag, text: str):
+        """Updates the text of a text tag, keeping the text caches updated."""
+        self._update_index()
+        text_tag.set_attr(QSCH_TEXT_STR_ATTR, text)
+        i = self._text_index[text_tag]
+        self._text_strs[i] = text.lstrip(QSCH_TEXT_INSTR_QUALIFIER)
+        self._text_uppers[i] = self._text_strs[i].upper()
+        self.directives[i] = self._text_from_tag(text_tag)
+        self._mark_indexed()
+
+    def _find_text(self, regex: re.Pattern):
+        """Returns the first text tag whose text, without the instruction qualifier, matches the regular expression
+        from its start. It returns a tuple with the tag and the match object, or (None, None) if no text matches."""
+        self._update_index()
+        for tag, line in zip(self._text_tags, self._text_strs):
+            match = regex.match(line)
+            if match:
+                return tag, match
+        return None, None
+
+    def get_parameter(self, param: str) -> str:
+        # docstring inherited from BaseEditor
+        param_regex = _param_regex(param)
+        tag, match = self._find_text(param_regex)
+        if match:
+            return match.group('value')
+        else:
+            raise ParameterNotFoundError(f"Parameter {param} not found in QSCH file")
+
+    def set_parameter(self, param: str, value: Union[str, int, float]) -> None:
+        # docstring inherited from BaseEditor
+        param_regex = _param_regex(param)
+        tag, match = self._find_text(param_regex)
+        if match:
+            _logger.debug(f"Parameter {param} found in QSCH file, updating it")
+            if isinstance(value, (int, float)):
+                value_str = format_eng(value)
+            else:
+                value_str = value
+            text: str = tag.get_attr(QSCH_TEXT_STR_ATTR)
+            # The match was done on the text without the instruction qualifier, which is a prefix of the text
+            offset = len(text) - len(match.string)
+            start, stop = match.span(param_regex.groupindex['replace'])
+            text = text[:start + offset] + "{}={}".format(param, value_str) + text[stop + offset:]
+            self._set_text(tag, text)
+            _logger.info(f"Parameter {param} updated to {value_str}")
+            _logger.debug(f"Text at {tag.get_attr(QSCH_TEXT_POS)} Updated to {text}")
+        else:
+            # Was not found so we need to add it,
+            _logger.debug(f"Parameter {param} not found in QSCH file, adding it")
+            x, y = self._get_text_space()
+            tag, _ = QschTag.parse(
+                f'«text ({x},{y}) 1 0 0 0x1000000 -1 -1 "{QSCH_TEXT_INSTR_QUALIFIER}.param {param}={value}"»'
+            )
+            self._add_item(tag)
+            _logger.info(f"Parameter {param} added with value {value}")
+            _logger.debug(f"Text added to {tag.get_attr(QSCH_TEXT_POS)} Added: {tag.get_attr(QSCH_TEXT_STR_ATTR)}")
+        self.updated = True
+
+    def add_instruction(self, instruction: str) -> None:
+        # docstring inherited from BaseEditor
+        instruction = instruction.strip()  # Clean any end of line terminators
+        command = instruction.split()[0].upper()
+
+        if command in UNIQUE_SIMULATION_DOT_INSTRUCTIONS:
+            # Before adding new instruction, if it is a unique instruction, we just replace it
+            self._update_index()
+            for text_tag, text_upped in zip(self._text_tags, self._text_uppers):
+                command = text_upped.split(None, 1)[0]
+                if command in UNIQUE_SIMULATION_DOT_INSTRUCTIONS:
+                    self._set_text(text_tag, QSCH_TEXT_INSTR_QUALIFIER + instruction)
+                    return  # Job done, can exit this method
+
+        elif command.startswith('.PARAM'):
+            raise RuntimeError('The .PARAM instruction should be added using the "set_parameter" method')
+        # If we get here, then the instruction was not found, so we need to add it
+        x, y = self._get_text_space()
+        tag, _ = QschTag.parse(f'«text ({x},{y}) 1 0 0 0x1000000 -1 -1 "{QSCH_TEXT_INSTR_QUALIFIER}{instruction}"»')
+        self._add_item(tag)
+
+    def remove_instruction(self, instruction: str) -> None:
+        # docstring inherited from BaseEditor
+        self._update_index()
+        for text_tag in self._text_tags:
+            text = text_tag.get_attr(QSCH_TEXT_STR_ATTR)
+            if instruction in text:
+                self._remove_item(text_tag)
+                _logger.info(f'Instruction "{instruction}" removed')
+                return  # Job done, can exit this method
+
+        msg = f'Instruction "{instruction}" not found'
+        _logger.error(msg)
+
+    def remove_Xinstruction(self, search_pattern: str) -> None:
+        # docstring inherited from BaseEditor
+        regex = re.compile(search_pattern, re.IGNORECASE)
+        self._update_index()
+        removed = []
+        for text_tag, text in zip(self._text_tags, self._text_strs):
+            if regex.match(text):
+                removed.append(text_tag)
+                _logger.info(f'Instruction "{text}" removed')
+        if removed:
+            self._remove_items(removed)
+        else:
+            msg = f'Instruction matching "{search_pattern}" not found'
+            _logger.error(msg)
+
+    def remove_component(self, designator: str):
+        # docstring inherited from BaseEditor
+        component = self.get_component(designator)
+        comp_tag: QschTag = component.attributes['tag']
+        self._remove_item(comp_tag)
+
+    def set_component_position(self, reference: str,
+                               position: Union[Point, tuple],
+                               rotation: Union[ERotation, int],
+                               mirror: bool = False,
+                               ) -> None:
+        # docstring inherited from BaseSchematic
+        self._update_index()
+        super().set_component_position(reference, position, rotation, mirror)
+        self._xs = self._ys = None
+        self._bbox = None
+        self._mark_indexed()
+
+    @staticmethod
+    def _tag_coordinates(tag: QschTag) -> tuple:
+        """Returns the coordinates that the tag occupies on the schematic canvas. As in spicelib, only the anchor
+        point of components is considered, not the extent of their symbol."""
+        if tag.tag in ('component', 'net', 'text'):
+            return tag.get_attr(1),
+        elif tag.tag == 'wire':
+            return tag.get_attr(1), tag.get_attr(2)
+        else:
+            return ()
+
+    def _compute_bbox(self) -> Optional[list]:
+        """Returns the bounding box of the schematic as [min_x, min_y, max_x, max_y], or None if the schematic has
+        no coordinates."""
+        if self._xs is None:
+            self._index_coordinates()
+        if not self._xs:
+            return None
+        return [min(self._xs), min(self._ys), max(self._xs), max(self._ys)]
+
+    def _get_text_space(self):
+        """
+        Returns the coordinate on the Schematic File canvas where a text can be appended.
+        """
+        self._update_index()
+        if self._bbox is None:
+            self._bbox = self._compute_bbox()
+        if self._bbox is None:
+            return 0, 0  # If no coordinates are found, we return the origin
+        else:
+            return self._bbox[0], self._bbox[1] - 240  # Setting the text in the bottom left corner of the canvas
+
+    def copy_from(self, editor: 'BaseSchematic') -> None:
+        # docstring inherited from BaseSchematic
+        super(QschEditorBase, self).copy_from(editor)
+        # We need to copy the schematic information
+        directives = None  # Unless copied from a netlist, the directives are read again from the copied text tags
+        if isinstance(editor, QschEditor):
+            from copy import deepcopy
+            self.schematic = deepcopy(editor.schematic)
+        elif isinstance(editor, QschEditorBase):
+            # The spicelib tags don't have the caches used here, so the schematic is read again
+            self.schematic, _ = QschTag.parse(editor.schematic.out(0))
+        else:
+            # Need to create a new schematic from the netlist
+            directives = self.directives  # Kept as copied. Each one matches the text tag made from it below
+            self.schematic = QschTag('schematic')
+            for ref, comp in self.components.items():
+                cmpx = comp.position.X
+                cmpy = comp.position.Y
+                rotation = int(comp.rotation) // 45
+                comp_tag, _ = QschTag.parse(f'«component ({cmpx},{cmpy}) {rotation} 0»')
+                if 'symbol' in comp.attributes:
+                    symbol = comp.attributes['symbol']
+                    if not isinstance(symbol, QschTag):
+                        symbol, _ = QschTag.parse(symbol.out(0))
+                    comp_tag.add_child(symbol)
+                self.schematic.add_child(comp_tag)
+
+            for labels in self.labels:
+                label_tag, _ = QschTag.parse('«net (0,0) 1 13 0 "0"»')
+                label_tag.set_attr(QSCH_NET_STR_ATTR, labels.text)
+                label_tag.set_attr(QSCH_NET_POS, (labels.coord.X, labels.coord.Y))
+                self.schematic.add_child(label_tag)
+
+            for wire in self.wires:
+                wire_tag, _ = QschTag.parse('«wire (0,0) (0,0) "0"»')
+                wire_tag.set_attr(QSCH_WIRE_POS1, (wire.V1.X, wire.V1.Y))
+                wire_tag.set_attr(QSCH_WIRE_POS2, (wire.V2.X, wire.V2.Y))
+                self.schematic.add_child(wire_tag)
+
+            for text in self.directives:
+                text_tag, _ = QschTag.parse('«text (0,0) 1 7 0 0x1000000 -1 -1 "text"»')
+                text_tag.set_attr(QSCH_TEXT_STR_ATTR, QSCH_TEXT_INSTR_QUALIFIER + text.text)
+                text_tag.set_attr(QSCH_TEXT_POS, (text.coord.X, text.coord.Y))
+                self.schematic.add_child(text_tag)
+        self._index_schematic(directives)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# coding=utf-8
+
+# -------------------------------------------------------------------------------
+#
+#  ███████╗██████╗ ██╗ ██████╗███████╗██╗     ██╗██████╗
+#  ██╔════╝██╔══██╗██║██╔════╝██╔════╝██║     ██║██╔══██╗
+#  ███████╗██████╔╝██║██║     █████╗  ██║     ██║██████╔╝
+#  ╚════██║██╔═══╝ ██║██║     ██╔══╝  ██║     ██║██╔══██╗
+#  ███████║██║     ██║╚██████╗███████╗███████╗██║██████╔╝
+#  ╚══════╝╚═╝     ╚═╝ ╚═════╝╚══════╝╚══════╝╚═╝╚═════╝
+#
+# Name:        run_task.py
+# Purpose:     Simulation task that reports its completion to the SimRunner
+#
+# Author:      Nuno Brum (nuno.brum@gmail.com)
+#
+# Created:     14-10-2026
+# Licence:     refer to the LICENSE file
+# -------------------------------------------------------------------------------
+"""
+Internal classes not to be used directly by the user
+"""
+__author__ = "Nuno Canto Brum <nuno.brum@gmail.com>"
+__copyright__ = "Copyright 2023, Fribourg Switzerland"
+
+import threading
+from queue import SimpleQueue
+from typing import Any, Tuple, Union
+
+from spicelib.sim.run_task import RunTask as RunTaskBase
+
+
+class RunTask(RunTaskBase):
+    """This is an internal Class and should not be used directly by the User.
+
+    Same as the spicelib RunTask, but when the simulation and its callback are finished, the task puts itself on the
+    queue given, so that the SimRunner doesn't need to check all the active tasks to know which ones have finished.
+    """
+
+    def __init__(self, *args, finished_queue: SimpleQueue = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.finished_queue = finished_queue
+        self.finished = threading.Event()  # Set once the simulation and the callback are done
+
+    def run(self):
+        try:
+            super().run()
+        finally:
+            # The completed tasks are kept by the SimRunner till the end, so anything passed to the callback is released
+            # now. Otherwise, the memory used by a long sweep would keep growing with the callback arguments.
+            self.callback_args = None
+            # Also done if the simulation raised an exception, otherwise the task would never be seen as finished
+            self.finished.set()
+            if self.finished_queue is not None:
+                self.finished_queue.put(self)
+
+    def get_results(self) -> Union[None, Any, Tuple[str, str]]:
+        # docstring inherited from spicelib RunTask
+        if not self.finished.is_set():
+            return None  # Not using is_alive(), as the thread is still alive after putting itself on the queue
+        if self.retcode == 0:  # All finished OK
+            if self.callback:
+                return self.callback_return
+            else:
+                return self.raw_file, self.log_file
+        else:
+            return '', ''
+
+    def wait_results(self) -> Union[Any, Tuple[str, str]]:
+        # docstring inherited from spicelib RunTask
+        self.finished.wait()
+        return self.get_results()
@@ -103,12 +103,37 @@ __copyright__ = "Copyright 2020, Fribourg Switzerland"
 
 __all__ = ['SimRunner']
 from pathlib import Path
+from queue import SimpleQueue, Empty
+from typing import Callable, Union, Type
+import logging
 
-from spicelib.sim.sim_runner import SimRunner as SimRunnerBase
+from spicelib.sim.sim_runner import SimRunner as SimRunnerBase, SimRunnerTimeoutError
+from spicelib.sim.run_task import clock_function
+from spicelib.sim.process_callback import ProcessCallback
 from spicelib.sim.simulator import Simulator
+from spicelib.editor.base_editor import BaseEditor
 from ..qspice import Qspice
+from .run_task import RunTask
 
-END_LINE_TERM = '\n'
+_logger = logging.getLogger("qspice.SimRunner")
+_WAIT_SLICE = 1.0  # Maximum time in seconds of each blocking wait, so that the wait can be interrupted with Ctrl-C
+
+
+def _simulator_from_path(path_to_exe: Union[str, Path]) -> Type[Simulator]:
+    """Returns the Qspice simulator set to use the given executable. Qspice.create_from() checks that the file exists
+    and then changes the Qspice class itself, so it is only called if Qspice isn't already set to that executable.
+    A plain cache of create_from() calls would go wrong as soon as another path was set in between."""
+    if Qspice.spice_exe == [Path(path_to_exe).as_posix()]:
+        return Qspice
+    return Qspice.create_from(path_to_exe)
+
+
+# How to get the simulator from the simulator argument of the SimRunner, for the most common argument types
+_SIMULATOR_RESOLVERS = {
+    type(None): lambda simulator: Qspice,
+    str: _simulator_from_path,
+    type(Path()): _simulator_from_path,
+}
 
 
 class SimRunner(SimRunnerBase):
@@ -134,14 +159,187 @@ class SimRunner(SimRunnerBase):
                  output_folder: str = None):
         """Class Constructor"""
         # Gets a simulator.
-        if simulator is None:
-            simulator = Qspice
-        elif isinstance(simulator, (str, Path)):
-            simulator = Qspice.create_from(simulator)
-        elif issubclass(simulator, Simulator):
-            simulator = simulator
-        else:
+        resolver = _SIMULATOR_RESOLVERS.get(type(simulator))
+        if resolver is not None:
+            simulator = resolver(simulator)
+        elif isinstance(simulator, (str, Path)):  # Subclasses of str or Path
+            simulator = _simulator_from_path(simulator)
+        elif not issubclass(simulator, Simulator):
             simulator = Qspice
+        self._finished_queue = SimpleQueue()  # The tasks put themselves here when they finish
         super().__init__(parallel_sims=parallel_sims, timeout=timeout, verbose=verbose,
                          output_folder=output_folder, simulator=simulator)
+        if self.output_folder is not None:
+            # Made absolute only once, instead of on every run, as the paths of all run files are based on it
+            self.output_folder = self.output_folder.absolute()
+
+    def run(self, netlist: Union[str, Path, BaseEditor], *, wait_resource: bool = True,
+            callback: Union[Type[ProcessCallback], Callable] = None,
+            callback_args: Union[tuple, dict] = None,
+            switches=None,
+            timeout: float = None, run_filename: str = None) -> Union[RunTask, None]:
+        # docstring inherited from spicelib SimRunner
+        callback_kwargs = self.validate_callback_args(callback, callback_args)
+        if switches is None:
+            switches = []
+        run_netlist_file = self._prepare_sim(netlist, run_filename)
+
+        if timeout is None:
+            timeout = self.timeout
+
+        if wait_resource:
+            # Give one second slack in relation to the task timeout
+            stop_time = None if timeout is None else clock_function() + timeout + 1
+            while self.active_threads() >= self.parallel_sims:
+                # Wakes up as soon as one of the other simulations ends
+                if stop_time is None:
+                    self._wait_task_completed(None)
+                elif clock_function() < stop_time:
+                    self._wait_task_completed(stop_time - clock_function())
+                else:
+                    _logger.error("Timeout waiting for resources for simulation %d" % self.runno)
+                    if self.verbose:
+                        _logger.warning("Timeout on launching simulation %d." % self.runno)
+                    return None
+
+        cmdline_switches = switches or self.cmdline_switches  # If switches are passed, they override the ones
+        # inside the class.
+        t = RunTask(self.simulator, self.runno, run_netlist_file, callback, callback_kwargs,
+                    cmdline_switches, timeout=timeout, verbose=self.verbose,
+                    finished_queue=self._finished_queue)
+        self.active_tasks.append(t)
+        t.start()  # Only returns after the thread has started, so no slack needs to be given
+        return t  # Returns the task object
+
+    def run_now(self, netlist: Union[str, Path, BaseEditor], *, switches=None, run_filename: str = None,
+                timeout: float = None) -> (str, str):
+        # docstring inherited from spicelib SimRunner
+        if switches is None:
+            switches = []
+        run_netlist_file = self._prepare_sim(netlist, run_filename)
+
+        cmdline_switches = switches or self.cmdline_switches  # If switches are passed, they override the ones inside
+        # the class.
+
+        if timeout is None:
+            timeout = self.timeout
+
+        def dummy_callback(raw, log):
+            """Dummy call back that does nothing"""
+            return None
+
+        t = RunTask(
+            simulator=self.simulator, runno=self.runno, netlist_file=run_netlist_file,
+            callback=dummy_callback, callback_args=None,
+            switches=cmdline_switches, timeout=timeout, verbose=self.verbose
+        )
+        t.start()
+        t.join(timeout + 1)  # Give one second slack in relation to the task timeout
+        self.completed_tasks.append(t)
+        if t.retcode == 0:
+            self.okSim += 1
+        else:
+            # simulation failed
+            self.failSim += 1
+        return t.raw_file, t.log_file  # Returns the raw and log file
+
+    def _task_completed(self, task: RunTask):
+        """Moves a finished task from the active_tasks list to the completed_tasks list."""
+        if task.retcode == 0:
+            self.okSim += 1
+        else:
+            # simulation failed
+            self.failSim += 1
+        self.active_tasks.remove(task)
+        self.completed_tasks.append(task)
+
+    def update_completed(self):
+        """
+        This function updates the active_tasks and completed_tasks lists. It moves the finished task from the
+        active_tasks list to the completed_tasks list.
+        Only the tasks that reported their completion are moved, so the active tasks don't need to be checked one
+        by one.
+
+        :returns: Nothing
+        """
+        get_finished = self._finished_queue.get_nowait  # Called on every run() and every wait, so kept local
+        task_completed = self._task_completed
+        while True:
+            try:
+                task = get_finished()
+            except Empty:
+                break
+            task_completed(task)
+
+    def _wait_task_completed(self, timeout: Union[float, None]) -> bool:
+        """
+        Waits until a task reports that it has finished, and then updates the active_tasks and completed_tasks lists.
+        The wait returns as soon as a task finishes, but it never blocks more than _WAIT_SLICE seconds.
+
+        :param timeout: Maximum time to wait in seconds. None for waiting up to _WAIT_SLICE.
+        :type timeout: float or None
+        :returns: True if a task finished, False if the wait timed out
+        :rtype: bool
+        """
+        timeout = _WAIT_SLICE if timeout is None else min(max(timeout, 0), _WAIT_SLICE)
+        try:
+            task = self._finished_queue.get(timeout=timeout)
+        except Empty:
+            return False
+        self._task_completed(task)
+        self.update_completed()  # Other tasks may have finished in the meantime
+        return True
+
+    def _maximum_stop_time(self):
+        # docstring inherited from spicelib SimRunner
+        alarm = None
+        for task in self.active_tasks:
+            tout = task.timeout if task.timeout is not None else self.timeout
+            if tout is not None:
+                # The task may not have had the time to store its start time yet
+                start = task.start_time if task.start_time is not None else clock_function()
+                stop = start + tout
+                if alarm is None or stop > alarm:
+                    alarm = stop
+        return alarm
+
+    def wait_completion(self, timeout=None, abort_all_on_timeout=False) -> bool:
+        # docstring inherited from spicelib SimRunner
+        self.update_completed()
+        if timeout is not None:
+            stop_time = clock_function() + timeout
+        while len(self.active_tasks) > 0:
+            if timeout is None:
+                stop_time = self._maximum_stop_time()
+            if stop_time is not None:  # This can happen if timeout was set as none everywhere
+                if clock_function() > stop_time:
+                    if abort_all_on_timeout:
+                        self.kill_all_ltspice()
+                    return False
+                self._wait_task_completed(stop_time - clock_function())
+            else:
+                self._wait_task_completed(None)
+
+        return self.failSim == 0
+
+    def __next__(self):
+        while True:
+            self.update_completed()  # Updates the active_tasks and completed_tasks lists
+            # First go through the completed tasks
+            if self._iterator_counter < len(self.completed_tasks):
+                ret = self.completed_tasks[self._iterator_counter]
+                self._iterator_counter += 1
+                return ret.get_results()
+
+            # Then check if there are any active tasks
+            if len(self.active_tasks) == 0:
+                raise StopIteration
+
+            # Then go through the active tasks to get the maximum timeout
+            stop_time = self._maximum_stop_time()
+
+            if stop_time is not None and clock_function() > stop_time:  # All tasks are on timeout condition
+                raise SimRunnerTimeoutError(f"Exceeded {self.timeout} seconds waiting for tasks to finish")
 
+            # Wait for the active tasks to finish with a timeout
+            self._wait_task_completed(None if stop_time is None else stop_time - clock_function())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python
+# coding=utf-8
+# -------------------------------------------------------------------------------
+#
+#  ███████╗██████╗ ██╗ ██████╗███████╗██╗     ██╗██████╗
+#  ██╔════╝██╔══██╗██║██╔════╝██╔════╝██║     ██║██╔══██╗
+#  ███████╗██████╔╝██║██║     █████╗  ██║     ██║██████╔╝
+#  ╚════██║██╔═══╝ ██║██║     ██╔══╝  ██║     ██║██╔══██╗
+#  ███████║██║     ██║╚██████╗███████╗███████╗██║██████╔╝
+#  ╚══════╝╚═╝     ╚═╝ ╚═════╝╚══════╝╚══════╝╚═╝╚═════╝
+#
+# Name:        test_qsch_editor.py
+# Purpose:     Checks that the QschEditor gives the same results as the spicelib one
+#
+# Author:      Nuno Brum (nuno.brum@gmail.com)
+#
+# Created:     14-10-2026
+# Licence:     refer to the LICENSE file
+# -------------------------------------------------------------------------------
+"""
+The files written by the QschEditor must be identical to the ones written by the spicelib QschEditor after the same
+edits, including when the tags are changed directly, as the spicelib editor does.
+"""
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from spicelib.editor.asc_editor import AscEditor
+from spicelib.editor.qsch_editor import QschEditor as QschEditorBase, QschTag as QschTagBase, QschReadingError
+
+try:
+    from qspice.editor.qsch_editor import QschEditor, QschTag
+except NotImplementedError:  # The qspice package can't be imported where QSPICE isn't available
+    raise unittest.SkipTest("QSPICE is not available on this platform")
+
+TEST_FILE = Path(__file__).parent.parent / 'examples' / 'testfiles' / 'AudioAmp.qsch'
+
+
+class TestQschEditor(unittest.TestCase):
+
+    def setUp(self):
+        self.folder = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.folder)
+        # The spicelib editor can't read fractional text sizes
+        text = TEST_FILE.read_bytes().decode('cp1252').replace('«text (7782,-340) 0.65 ', '«text (7782,-340) 1 ')
+        self.qsch_file = self.folder / 'AudioAmp.qsch'
+        self.qsch_file.write_bytes(text.encode('cp1252'))
+
+    def saved(self, editor, name: str) -> bytes:
+        """Saves the schematic and returns the file contents"""
+        path = self.folder / name
+        editor.save_as(path)
+        return path.read_bytes()
+
+    def test_round_trip(self):
+        outputs = []
+        for editor_class in (QschEditorBase, QschEditor):
+            editor = editor_class(self.qsch_file)
+            output = [self.saved(editor, 'unchanged.qsch')]
+            editor.set_parameter('run', 1)
+            editor.set_parameter('foo', 3)
+            editor.set_component_value('R1', '3.3k')
+            editor.add_instruction('.tran 0 5m')
+            editor.add_instruction('.meas x y')
+            output.append(self.saved(editor, 'edited.qsch'))
+            editor.remove_instruction('.meas x y')
+            editor.remove_component('R2')
+            output.append(self.saved(editor, 'removed.qsch'))
+            outputs.append(output)
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_tags_changed_directly(self):
+        outputs = []
+        for editor_class, tag_class in ((QschEditorBase, QschTagBase), (QschEditor, QschTag)):
+            editor = editor_class(self.qsch_file)
+            output = [self.saved(editor, 'unchanged.qsch')]
+            tag, _ = tag_class.parse('«text (0,0) 1 7 0 0x1000000 -1 -1 "added"»')
+            editor.schematic.items.append(tag)
+            output.append(self.saved(editor, 'appended.qsch'))
+            tag.tokens[8] = '"changed"'
+            editor.get_component('R1').attributes['tag'].tokens[1] = '(100,100)'
+            output.append(self.saved(editor, 'tokens.qsch'))
+            del editor.schematic.items[0]
+            editor.schematic.items.insert(1, tag_class.parse('«net (0,0) 1 13 0 "N1"»')[0])
+            output.append(self.saved(editor, 'replaced.qsch'))
+            outputs.append(output)
+        self.assertEqual(outputs[0], outputs[1])
+
+    def test_items_changed_directly(self):
+        editor = QschEditor(self.qsch_file)
+        nets = editor.schematic.get_items('net')
+        tag, _ = QschTag.parse('«net (0,0) 1 13 0 "N1"»')
+        editor.schematic.items.append(tag)
+        self.assertEqual(editor.schematic.get_items('net'), nets + [tag])
+        editor.schematic.items = [tag]
+        self.assertEqual(editor.schematic.get_items('net'), [tag])
+        self.assertEqual(editor.schematic.get_items('component'), [])
+        tag.tokens[0] = 'wire'
+        self.assertEqual(editor.schematic.get_items('wire'), [tag])
+
+    def test_parameter_added_directly(self):
+        outputs = []
+        for editor_class, tag_class in ((QschEditorBase, QschTagBase), (QschEditor, QschTag)):
+            editor = editor_class(self.qsch_file)
+            self.assertEqual(editor.get_parameter('x'), '15')
+            tag, _ = tag_class.parse('«text (0,0) 1 7 0 0x1000000 -1 -1 ".param zz=7"»')
+            editor.schematic.items.append(tag)
+            output = [editor.get_parameter('zz')]
+            editor.set_parameter('zz', 8)
+            output.append(editor.get_parameter('zz'))
+            tag.tokens[8] = '".param zz=9"'
+            output.append(editor.get_parameter('zz'))
+            output.append(self.saved(editor, 'parameter.qsch'))
+            outputs.append(output)
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(outputs[1][:3], ['7', '8', '9'])
+
+    def test_copy_from_spicelib_editor(self):
+        source = QschEditorBase(self.qsch_file)
+        source.add_instruction('.meas qq max V(out)')
+        editor = QschEditor(self.qsch_file)
+        editor.copy_from(source)
+        self.assertEqual(len(editor.directives), len(editor.schematic.get_items('text')))
+        editor.remove_instruction('.meas qq')
+        self.assertNotIn('.meas qq max V(out)', [directive.text for directive in editor.directives])
+
+    def test_copy_from_asc_editor(self):
+        asc_file = self.folder / 'circuit.asc'
+        asc_file.write_text('Version 4\nSHEET 1 880 680\nWIRE 160 96 64 96\nFLAG 64 96 0\n'
+                            'TEXT 40 200 Left 2 !.tran 1m\nTEXT 40 240 Left 3 ;a comment\n')
+        source = AscEditor(asc_file)
+        directives = []
+        for editor_class in (QschEditorBase, QschEditor):
+            editor = editor_class(self.qsch_file)
+            editor.copy_from(source)
+            directives.append([(text.text, text.type, text.size) for text in editor.directives])
+        self.assertEqual(directives[0], directives[1])
+        editor.remove_instruction('a comment')
+        self.assertEqual([(text.text, text.type, text.size) for text in editor.directives], directives[0][:1])
+
+    def test_unterminated_tokens(self):
+        for stream in ('«text (1,2) "x»', '«a (1,2 »'):
+            with self.assertRaises(QschReadingError):
+                QschTag.parse(stream)
+
+
+if __name__ == '__main__':
+    unittest.main()